@@ -2,13 +2,14 @@
 import os
 import re
 import tempfile
-from typing import List
+from typing import Dict, List, Optional
 
 import pandas as pd
 import streamlit as st
 
 # app uses the library functions
 from screener.matcher import rank_resumes_against_jd
+from screener.nlp import NameCharTable, get_embedder
 from screener.parser import load_file
 
 # parse_resume is parser-only (no UI) — import normally
@@ -68,6 +69,11 @@ st.markdown("---")
 st.markdown("#### 📑 Or upload a CSV (columns: type, text)")
 csv_file = st.file_uploader("", type=["csv"], key="csv")
 
+# ---------- cached model (survives Streamlit reruns) ----------
+@st.cache_resource(show_spinner="Loading embedding model...")
+def load_embedder(name: str):
+    return get_embedder(name)
+
 # ---------- helper: save uploaded file to temp and return text ----------
 def file_to_text(uploaded) -> str:
     suffix = "." + uploaded.name.split(".")[-1].lower()
@@ -77,18 +83,35 @@ def file_to_text(uploaded) -> str:
         path = tmp.name
     return load_file(path)
 
+PREVIEW_CHARS = 10_000  # previews show at most this much text
+
+def resume_text(
+    path: str, csv_texts: Optional[Dict[str, str]], max_chars: Optional[int] = None
+) -> str:
+    # only used when the matcher's `details` have no usable text for `path`
+    if csv_texts is not None and path in csv_texts:
+        return csv_texts[path][:max_chars]
+    return load_file(path, max_chars=max_chars)
+
 # ---------- name cleaning helper (keeps UI-friendly names) ----------
+_SPLIT_NAME_RE = re.compile(r'[:\-–—|/]')
+_NAME_CHARS = NameCharTable("-'.")
+_FILENAME_NOISE_RE = re.compile(r'[_\-\.\d]+')
+_NON_ALNUM_RE = re.compile(r'[^0-9a-z]')
+
 def clean_name_raw(s: str) -> str:
     if not s:
         return "Unknown"
-    s = re.split(r'[:\-–—|/]', s, 1)[0]
-    s = re.sub(r'\s+', ' ', re.sub(r'[^A-Za-z\s\-\'\.]', ' ', s)).strip()
-    return " ".join(p.title() for p in s.split()[:5]) if s else "Unknown"
+    s = _SPLIT_NAME_RE.split(s, 1)[0]
+    parts = s.translate(_NAME_CHARS).split()
+    return " ".join(p.title() for p in parts[:5]) if parts else "Unknown"
 
 # ---------- compute action ----------
 if st.button("🚀 Compute Rankings"):
     jd_text = None
     resume_paths: List[str] = []
+    # CSV rows are kept in memory (label -> text) instead of round-tripping via temp files
+    csv_texts: Optional[Dict[str, str]] = None
 
     # Case CSV upload
     if csv_file is not None:
@@ -98,12 +121,9 @@ if st.button("🚀 Compute Rankings"):
             if not jd_rows.empty:
                 jd_text = jd_rows.iloc[0]["text"]
             resume_rows = df_csv[df_csv["type"].str.lower() == "resume"]
-            for _, row in resume_rows.iterrows():
-                text = row["text"]
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as tmp:
-                    tmp.write(text.encode("utf-8"))
-                    tmp.flush()
-                    resume_paths.append(tmp.name)
+            texts = resume_rows["text"].fillna("").astype(str).tolist()
+            resume_paths = [f"csv_row_{i + 1}.txt" for i in range(len(texts))]
+            csv_texts = dict(zip(resume_paths, texts))
         except Exception as e:
             st.error(f"Error reading CSV: {e}")
             st.stop()
@@ -123,22 +143,33 @@ if st.button("🚀 Compute Rankings"):
     else:
         with st.spinner("Computing similarity and skill matches..."):
             # main ranking function lives in screener.matcher
-            df = rank_resumes_against_jd(jd_text, resume_paths, use_spacy=use_spacy, model_name=model_name)
+            df, details = rank_resumes_against_jd(
+                jd_text, resume_paths, use_spacy=use_spacy, model_name=model_name,
+                embedder=load_embedder(model_name),
+                resume_texts=list(csv_texts.values()) if csv_texts is not None else None,
+                return_details=True,
+            )
+
+        # text + parse_resume output per path, as computed by the matcher
+        def _details_for(path: str):
+            d = details.get(path)
+            if d is not None and not d["text"].startswith("__ERROR__"):
+                return d["text"], d["parsed"] or {}
+            try:
+                txt = resume_text(path, csv_texts)
+            except Exception:
+                return "", {}
+            try:
+                return txt, parse_resume(txt) or {}
+            except Exception:
+                return txt, {}
 
         # ---------- map temp filenames to nicer candidate names ----------
         try:
             name_map = {}
             for p in resume_paths:
                 base = os.path.basename(p)
-                try:
-                    txt = load_file(p)
-                except Exception:
-                    txt = ""
-                parsed = {}
-                try:
-                    parsed = parse_resume(txt) or {}
-                except Exception:
-                    parsed = {}
+                txt, parsed = _details_for(p)
 
                 # prefer parser name if present
                 raw_name = parsed.get("name") if isinstance(parsed, dict) else None
@@ -157,22 +188,27 @@ if st.button("🚀 Compute Rankings"):
                         nice = clean_name_raw(first_line)
                     else:
                         noext = os.path.splitext(base)[0]
-                        nice = clean_name_raw(re.sub(r'[_\-\.\d]+', ' ', noext))
+                        nice = clean_name_raw(_FILENAME_NOISE_RE.sub(' ', noext))
 
                 name_map[base] = nice or base
 
             # replace values in df["candidate_name"] when present
             if "candidate_name" in df.columns:
-                def _replace(val, idx):
-                    if not isinstance(val, str):
-                        return val
-                    b = os.path.basename(val)
-                    if b in name_map:
-                        return name_map[b]
+                names = df["candidate_name"]
+                is_str = names.map(lambda v: isinstance(v, str))
+                basenames = names.where(is_str, "").map(os.path.basename)
+
+                # fast path: exact basename hits via a single Series.map
+                hit = is_str & basenames.isin(list(name_map))
+                new_names = names.where(~hit, basenames.map(name_map))
+
+                # slow path only for the residual rows without an exact hit
+                norm_keys = [(_NON_ALNUM_RE.sub('', k.lower()), v) for k, v in name_map.items()]
+
+                def _fallback(val, idx):
                     # try normalized matching
-                    vnorm = re.sub(r'[^0-9a-z]', '', val.lower())
-                    for k, v in name_map.items():
-                        kn = re.sub(r'[^0-9a-z]', '', k.lower())
+                    vnorm = _NON_ALNUM_RE.sub('', val.lower())
+                    for kn, v in norm_keys:
                         if kn == vnorm or kn in vnorm or vnorm in kn:
                             return v
                     # index fallback
@@ -180,7 +216,9 @@ if st.button("🚀 Compute Rankings"):
                         return name_map.get(os.path.basename(resume_paths[idx]), val)
                     return val
 
-                df["candidate_name"] = df.apply(lambda r: _replace(r["candidate_name"], r.name), axis=1)
+                for idx in df.index[is_str & ~hit]:
+                    new_names.at[idx] = _fallback(names.at[idx], idx)
+                df["candidate_name"] = new_names
         except Exception:
             # don't break UI for name-fixing issues
             pass
@@ -215,15 +253,15 @@ if st.button("🚀 Compute Rankings"):
         st.markdown("### Resume previews")
         for i, path in enumerate(resume_paths):
             base = os.path.basename(path)
-            try:
-                txt = load_file(path)
-            except Exception:
-                txt = ""
-            parsed = {}
-            try:
-                parsed = parse_resume(txt) or {}
-            except Exception:
-                parsed = {}
+            d = details.get(path)
+            if d is not None and not d["text"].startswith("__ERROR__"):
+                txt = d["text"][:PREVIEW_CHARS]
+            else:
+                # preview-only read: stop after PREVIEW_CHARS
+                try:
+                    txt = resume_text(path, csv_texts, max_chars=PREVIEW_CHARS)
+                except Exception:
+                    txt = ""
 
             # matched skills from parsed vs JD (if present in df)
             matched = ""
@@ -240,12 +278,15 @@ if st.button("🚀 Compute Rankings"):
                     preview_html = txt
                     # escape basic HTML then highlight words (quick)
                     safe_preview = preview_html.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-                    for skill in (matched.split(",") if matched else []):
-                        skill = skill.strip()
-                        if not skill:
-                            continue
-                        # simple case-insensitive replace with mark
-                        safe_preview = re.sub(fr"(?i)\b({re.escape(skill)})\b", r"<mark>\1</mark>", safe_preview)
+                    skills = [sk.strip() for sk in matched.split(",") if sk.strip()]
+                    if skills:
+                        # one case-insensitive pattern for all skills, longest first
+                        skills.sort(key=len, reverse=True)
+                        # same alphanumeric boundaries as the parser, so c++ / c# match too
+                        skill_re = re.compile(
+                            fr"(?<![a-z0-9])({'|'.join(map(re.escape, skills))})(?![a-z0-9])", re.I
+                        )
+                        safe_preview = skill_re.sub(r"<mark>\1</mark>", safe_preview)
                     st.markdown(f"<div style='white-space:pre-wrap'>{safe_preview}</div>", unsafe_allow_html=True)
                 else:
-                    st.code(txt[:10000])  # show up to 10k chars
+                    st.code(txt)  # already capped at PREVIEW_CHARS
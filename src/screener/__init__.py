@@ -1 +1 @@
-__all__ = ["parser", "nlp", "matcher"]
+__all__ = ["parser", "nlp", "matcher", "embed_cache"]
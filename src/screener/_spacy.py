@@ -0,0 +1,14 @@
+"""
+Shared spaCy pipeline loader. Each distinct `disable` set is loaded once.
+"""
+from __future__ import annotations
+from functools import lru_cache
+from typing import Tuple
+
+
+@lru_cache(maxsize=4)
+def get_nlp(disable: Tuple[str, ...] = ("tagger", "parser", "lemmatizer", "attribute_ruler")):
+    import spacy
+    nlp = spacy.load("en_core_web_sm", disable=list(disable))
+    nlp.max_length = 5_000_000  # allow up to 5M chars
+    return nlp
@@ -0,0 +1,137 @@
+"""
+Persistent on-disk cache of resume embeddings, keyed by content hash.
+Vectors are stored as float16 .npy files under ~/.cache/ai_resume_screener/emb
+(override with AI_RESUME_SCREENER_CACHE).
+"""
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence
+import contextlib
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+from .nlp import clean_text
+
+try:
+    import fcntl  # POSIX only
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+CACHE_DIR = os.environ.get(
+    "AI_RESUME_SCREENER_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "ai_resume_screener", "emb"),
+)
+
+
+def _key(text: str, model_name: str) -> str:
+    h = hashlib.sha256()
+    h.update(model_name.encode("utf-8"))
+    h.update(b"\0")
+    h.update(clean_text(text).encode("utf-8"))
+    return h.hexdigest()
+
+
+@contextlib.contextmanager
+def _locked(cache_dir: str):
+    """Exclusive lock on the cache dir so concurrent CLI runs don't interleave writes."""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(cache_dir, ".lock"), "a") as lf:
+        fcntl.flock(lf, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lf, fcntl.LOCK_UN)
+
+
+def _load(path: str) -> Optional[np.ndarray]:
+    try:
+        return np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        # missing or half-written entry -> treat as a miss
+        return None
+
+
+def _store(path: str, vec: np.ndarray) -> None:
+    # write to a temp file then rename, so readers never see a partial file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, vec.astype(np.float16))
+        os.replace(tmp, path)
+    except Exception:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+
+def get_or_compute(
+    texts: List[str],
+    encoder,
+    cache_dir: Optional[str] = None,
+    uncached_prefix: Sequence[str] = (),
+) -> np.ndarray:
+    """
+    Return float16 embeddings for `texts`, encoding only those not already on disk.
+    `encoder` is an Embedder (anything with .encode(list) and .model_name).
+    `uncached_prefix` texts (e.g. the JD) go through the same encode call but
+    are never cached; their vectors come first in the result.
+    Duplicate texts (same content hash) are looked up / encoded only once.
+    """
+    prefix = list(uncached_prefix)
+    if not texts:
+        return np.asarray(encoder.encode(prefix), dtype=np.float16)
+
+    cache_dir = cache_dir or CACHE_DIR
+    model_name = getattr(encoder, "model_name", "")
+    if getattr(encoder, "onnx", None) is not None:
+        # int8 ONNX and fp32 vectors for the same name must not share entries
+        model_name += ":onnx-int8"
+
+    # dedupe on the content hash; `inverse` maps each input to its unique row
+    keys = [_key(t, model_name) for t in texts]
+    slot: Dict[str, int] = {}
+    uniq: List[int] = []
+    inverse: List[int] = []
+    for i, k in enumerate(keys):
+        if k not in slot:
+            slot[k] = len(uniq)
+            uniq.append(i)
+        inverse.append(slot[k])
+    uniq_texts = [texts[i] for i in uniq]
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        # unwritable cache location -> just encode everything
+        encoded = np.asarray(encoder.encode(prefix + uniq_texts), dtype=np.float16)
+        return np.concatenate([encoded[:len(prefix)], encoded[len(prefix):][inverse]])
+
+    paths = [os.path.join(cache_dir, f"{keys[i]}.npy") for i in uniq]
+
+    vecs: List[Optional[np.ndarray]] = [_load(p) for p in paths]
+    misses = [i for i, v in enumerate(vecs) if v is None]
+
+    # one forward pass for the prefix plus every miss
+    prefix_vecs = []
+    if prefix or misses:
+        encoded = encoder.encode(prefix + [uniq_texts[i] for i in misses])
+        prefix_vecs, new_vecs = list(encoded[:len(prefix)]), encoded[len(prefix):]
+    if misses:
+        try:
+            with _locked(cache_dir):
+                for i, v in zip(misses, new_vecs):
+                    _store(paths[i], v)
+        except OSError:
+            # caching is best-effort
+            pass
+        for i, v in zip(misses, new_vecs):
+            vecs[i] = v
+
+    uniq_vecs = np.vstack([np.asarray(v, dtype=np.float16) for v in vecs])
+    if not prefix_vecs:
+        return uniq_vecs[inverse]
+    return np.concatenate([np.vstack(prefix_vecs).astype(np.float16), uniq_vecs[inverse]])
@@ -1,36 +1,59 @@
 import re
-import spacy
 from spacy.lang.en.stop_words import STOP_WORDS
 
-# load once and relax the limit
-nlp = spacy.load("en_core_web_sm")
-nlp.max_length = 5_000_000  # allow up to 5M chars
+from ._spacy import get_nlp
+from .resume_parser import SKILLS, find_skills
+
+# only lemmas are needed here; NER and the dependency parser are skipped
+_JD_DISABLE = ("ner", "parser")
 
 _WORD_RE = re.compile(r"[A-Za-z]+")
 
+# crude suffix stripping (stand-in for lemmatization); skill words are left alone
+_SUFFIXES = ("ing", "ed", "ly", "s")
+_NO_STEM = frozenset(SKILLS)
+
+def _stem(tok: str) -> str:
+    if tok in _NO_STEM or len(tok) <= 4:
+        return tok
+    for suf in _SUFFIXES:
+        if tok.endswith(suf) and not tok.endswith("ss") and len(tok) - len(suf) >= 3:
+            return tok[: -len(suf)]
+    return tok
+
 def _simple_tokens(text: str):
-    """Very fast fallback tokenizer (no spaCy) for huge texts."""
+    """Very fast tokenizer (no spaCy): lowercase, drop stopwords, strip suffixes."""
     text = text.lower()
-    toks = [t for t in _WORD_RE.findall(text) if t not in STOP_WORDS]
-    return list(set(toks))  # unique
+    toks = {_stem(t) for t in _WORD_RE.findall(text) if t not in STOP_WORDS}
+    return list(toks)  # unique
 
-def parse_jd(text: str):
+def parse_jd(text: str, use_spacy: bool = False):
     """
     Return unique keywords from JD.
-    Uses spaCy normally; falls back to regex tokenization for very long texts.
+    Uses the regex tokenizer by default; spaCy lemmatization only when
+    use_spacy=True (and the text is not huge).
     """
     if text is None:
         return []
 
     text = text.strip()
-    # If insanely large, skip spaCy pipeline to avoid memory spikes
-    if len(text) > 300_000:
+    # spaCy is opt-in; if insanely large, skip it anyway to avoid memory spikes
+    if not use_spacy or len(text) > 300_000:
         return _simple_tokens(text)
 
     try:
-        doc = nlp(text.lower())
+        doc = get_nlp(_JD_DISABLE)(text.lower())
         tokens = [t.lemma_ for t in doc if t.is_alpha and t.text not in STOP_WORDS]
         return list(set(tokens))
     except Exception:
         # any parsing failure -> fallback
         return _simple_tokens(text)
+
+def extract_jd_skills(text: str):
+    """
+    Return the SKILLS lexicon entries mentioned in the JD (sorted).
+    One pass over the text; no tokenization or lemmatization.
+    """
+    if not text:
+        return []
+    return sorted(find_skills(text.lower()))
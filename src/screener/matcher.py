@@ -3,16 +3,56 @@ Similarity and ranking utilities with semantic + skill matching.
 """
 from __future__ import annotations
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
 import re
+import numpy as np
 import pandas as pd
 from .parser import load_file
-from .nlp import clean_text, Embedder, extract_entities_spacy
-# NOTE: do NOT import parse_resume at module level - import it lazily in the function
-from .jd_parser import parse_jd, _simple_tokens
-from sklearn.metrics.pairwise import cosine_similarity
+from .nlp import (
+    clean_text, clean_text_lines, Embedder, get_embedder, extract_entities_spacy_many,
+    NameCharTable,
+)
+from .embed_cache import get_or_compute
+from .jd_parser import extract_jd_skills
+from .resume_parser import parse_resume
 import os
 
+try:
+    import simsimd  # optional SIMD kernels for bulk cosine
+except ImportError:
+    simsimd = None
+
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_EMAIL_SEP_RE = re.compile(r"[._+-]+")
+_RESUME_EXT_RE = re.compile(r"\.(txt|pdf|docx)$", re.I)
+_NAME_CHARS = NameCharTable("-'")
+# _rank_one takes ~0.25 ms per resume, while starting a fresh worker process
+# (interpreter + pandas/numpy imports) costs tens of ms per CPU; below this
+# many resumes a process pool costs more than it saves
+_PARALLEL_MIN_RESUMES = 2000
+
+_WS2_RE = re.compile(r"\s{2,}")
+_EDU_BLOCK_RE = re.compile(
+    r"(?is)education\s*[:\-]\s*(.+?)(?:\n\s*\n|$|\n(?:skills|experience|projects|certifications)\b)"
+)
+
+
+def _cosine_scores(jd_vec: np.ndarray, res_vecs: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of one JD vector (shape (1, D)) against N resume vectors.
+    Uses SimSIMD when installed (native fp16 kernels), else a plain dot product
+    (inputs are L2-normalized). Returns float32 scores.
+    """
+    if simsimd is not None and len(res_vecs):
+        jd = np.ascontiguousarray(jd_vec, dtype=np.float16)
+        res = np.ascontiguousarray(res_vecs, dtype=np.float16)
+        dists = np.asarray(simsimd.cdist(jd, res, metric="cosine")).ravel()
+        return (1.0 - dists).astype(np.float32)
+    # NumPy has no BLAS path for float16, so upcast for the GEMV itself
+    return res_vecs.astype(np.float32) @ jd_vec[0].astype(np.float32)
+
 
 def extract_candidate_name(text: str, path: str) -> str:
     """
@@ -31,10 +71,10 @@ def extract_candidate_name(text: str, path: str) -> str:
                 return ln.strip()
 
     # 2) Try email local-part
-    m = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", text)
+    m = _EMAIL_RE.search(text)
     if m:
         local = m.group(0).split("@")[0]
-        guess = " ".join(re.split(r"[._+-]+", local)).strip()
+        guess = " ".join(_EMAIL_SEP_RE.split(local)).strip()
         if guess:
             guess_tc = " ".join(w.capitalize() for w in guess.split() if w)
             if len(guess_tc.split()) <= 6:
@@ -42,7 +82,7 @@ def extract_candidate_name(text: str, path: str) -> str:
 
     # 3) Fallback to filename
     fname = path.split("/")[-1]
-    base = re.sub(r"\.(txt|pdf|docx)$", "", fname, flags=re.I)
+    base = _RESUME_EXT_RE.sub("", fname)
     base = base.replace("_", " ").replace("-", " ").strip()
     return base or fname
 
@@ -51,36 +91,25 @@ def extract_candidate_name(text: str, path: str) -> str:
 def _looks_like_name(s: str) -> bool:
     if not s or len(s) > 120:
         return False
-    # remove punctuation then check token pattern
-    s2 = re.sub(r"[^A-Za-z\s\-']", " ", s).strip()
-    tokens = [t for t in s2.split() if t]
-    if not (1 < len(tokens) <= 5):
-        return False
-    # tokens should be alphabetic-ish and capitalized or all lower (we'll allow both)
-    for t in tokens[:4]:
-        if not re.match(r"^[A-Za-z\-']+$", t):
-            return False
-    return True
+    # blank out punctuation; what's left is letters, hyphens and apostrophes
+    return 1 < len(s.translate(_NAME_CHARS).split()) <= 5
 
 
-def _clean_education_list(edu_list: List[str], candidate_name: str | None = None) -> List[str]:
+def _clean_education_list(edu_list: List[str]) -> List[str]:
     out = []
     seen = set()
     for e in edu_list or []:
         if not isinstance(e, str):
             continue
-        e_clean = e.strip()
+        # collapse whitespace (also strips)
+        e_clean = " ".join(e.split())
         if not e_clean:
             continue
-        # drop if it's obviously a name
+        # drop if it's obviously a name (the candidate's or noise)
         if _looks_like_name(e_clean):
-            # if it exactly equals candidate name, drop
-            if candidate_name and e_clean.strip().lower() == candidate_name.strip().lower():
-                continue
-            # otherwise drop as likely noise
             continue
-        # remove extremely long lines and collapse whitespace
-        e_clean = re.sub(r"\s{2,}", " ", e_clean)[:240].strip()
+        # remove extremely long lines
+        e_clean = e_clean[:240].strip()
         if e_clean and e_clean not in seen:
             out.append(e_clean)
             seen.add(e_clean)
@@ -92,124 +121,188 @@ def _extract_education_block_via_regex(text: str) -> List[str]:
     Fallback: quick regex to capture an 'Education:' block.
     Returns first meaningful line(s) following 'Education:'.
     """
-    matches = re.search(r"(?is)education\s*[:\-]\s*(.+?)(?:\n\s*\n|$|\n(?:skills|experience|projects|certifications)\b)", text)
+    matches = _EDU_BLOCK_RE.search(text)
     if not matches:
         return []
     block = matches.group(1).strip()
     lines = [ln.strip() for ln in block.splitlines() if ln.strip()]
     if not lines:
         # maybe it's a single-line block
-        block_line = re.sub(r"\s{2,}", " ", block)
+        block_line = _WS2_RE.sub(" ", block)
         return [block_line[:240]] if block_line else []
     # return up to 3 lines cleaned
     out = []
     for ln in lines[:3]:
-        ln2 = re.sub(r"\s{2,}", " ", ln)
+        ln2 = _WS2_RE.sub(" ", ln)
         if not _looks_like_name(ln2):
             out.append(ln2[:240])
     return out
 
 
+def _safe_load(path: str) -> str:
+    try:
+        return clean_text_lines(load_file(path))
+    except Exception as e:
+        return f"__ERROR__ {e}"
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _rank_one(args) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Score one resume; module-level so it can run in a worker process.
+    `args` is (path, text, similarity, entities, jd_kw_set, use_spacy).
+    Returns (dataframe row, parse_resume output).
+    """
+    path, text, score, ents, jd_kw_set, use_spacy = args
+    # Candidate name detection
+    candidate_name = extract_candidate_name(text, path)
+
+    item: Dict[str, Any] = {
+        "candidate_name": candidate_name,
+        "similarity": float(score),
+        "length_chars": len(text),
+        # show first 5 lines of resume text for debugging (optional)
+        "debug_preview": "\n".join(text.splitlines()[:5]) if not text.startswith("__ERROR__") else text,
+    }
+    resume_info: Dict[str, Any] = {}
+
+    if not text.startswith("__ERROR__"):
+        # call parser (may be custom)
+        try:
+            resume_info = parse_resume(text) or {}
+        except Exception:
+            resume_info = {}
+
+        # resume_info["skills"] expected to be a list
+        skills_list = resume_info.get("skills") if isinstance(resume_info.get("skills"), list) else []
+        skills_list = [sk.lower() for sk in skills_list if isinstance(sk, str)]
+        matched_skills = sorted(jd_kw_set.intersection(skills_list))
+        skill_overlap = len(matched_skills) / max(1, len(jd_kw_set))
+        final_score = 0.7 * score + 0.3 * skill_overlap
+
+        # education processing - defensive cleanup
+        raw_edu = resume_info.get("education") if isinstance(resume_info.get("education"), list) else []
+        cleaned_edu = _clean_education_list(raw_edu)
+
+        # fallback: try regex-based extraction if nothing valid
+        if not cleaned_edu:
+            cleaned_edu = _extract_education_block_via_regex(text)
+
+        # final join for dataframe cell
+        edu_cell = ", ".join(cleaned_edu) if cleaned_edu else ""
+
+        # experience processing (expect list)
+        exp_list = resume_info.get("experience") if isinstance(resume_info.get("experience"), list) else []
+        exp_cell = ", ".join(exp_list[:3]) if exp_list else ""
+
+        item.update({
+            "final_score": round(final_score, 3),
+            "skill_overlap": round(skill_overlap, 3),
+            "matched_skills": ", ".join(matched_skills),
+            "education": edu_cell,
+            "experience": exp_cell,
+        })
+
+        if use_spacy:
+            try:
+                item["ORGs"] = ", ".join(sorted(set(ents.get("ORG", [])[:5])))
+                item["PERSONs"] = ", ".join(sorted(set(ents.get("PERSON", [])[:3])))
+                item["DATEs"] = ", ".join(sorted(set(ents.get("DATE", [])[:3])))
+            except Exception:
+                # if spacy entity extraction fails, skip it
+                pass
+
+    return item, resume_info
+
+
 def rank_resumes_against_jd(
     jd_text: str,
     resume_paths: List[str],
     use_spacy: bool = False,
-    model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
-) -> pd.DataFrame:
+    model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+    embedder: Optional[Embedder] = None,
+    resume_texts: Optional[List[str]] = None,
+    return_details: bool = False,
+):
     """
     Compare resumes against a job description using embeddings + skill overlap.
-    parse_resume is imported lazily here to avoid circular imports.
+    Pass `embedder` to reuse an already-loaded model; otherwise a cached one
+    for `model_name` is used.
+    If `resume_texts` is given, those texts are used as-is (no file reads) and
+    `resume_paths` only serve as labels; both lists must have the same length.
+    Returns the ranked DataFrame, or `(df, details)` when `return_details` is
+    set, where details maps each path to {"text": ..., "parsed": ...} so callers
+    can reuse the loaded text and parse_resume output.
     """
-    # Lazy import of parse_resume to avoid circular import issues
-    try:
-        from .resume_parser import parse_resume  # local import
-    except Exception:
-        # Fallback minimal parser if original isn't available for some reason
-        def parse_resume(text: str) -> Dict[str, Any]:
-            return {"skills": [], "education": [], "experience": []}
-
-    embedder = Embedder(model_name=model_name)
+    if embedder is None:
+        embedder = get_embedder(model_name)
 
-    # Clean and parse job description
+    # Clean job description and pick out the lexicon skills it asks for;
+    # skill_overlap is the fraction of these the resume covers.
+    # (Resumes keep their line breaks - see clean_text_lines - since name,
+    # section and education heuristics work line by line.)
     jd_text = clean_text(jd_text)
-    try:
-        jd_keywords = parse_jd(jd_text)
-    except Exception:
-        jd_keywords = _simple_tokens(jd_text)
+    jd_keywords = extract_jd_skills(jd_text)
+    jd_kw_set = frozenset(jd_keywords)
 
     resumes: List[str] = []
-    for p in resume_paths:
+    if resume_texts is not None:
+        if len(resume_texts) != len(resume_paths):
+            raise ValueError("resume_texts and resume_paths must have the same length")
+        resumes = [clean_text_lines(t) for t in resume_texts]
+    elif resume_paths:
+        # file decoding (PyMuPDF, python-docx, disk reads) overlaps well in threads;
+        # map() keeps the input order
+        with ThreadPoolExecutor(max_workers=min(16, len(resume_paths))) as ex:
+            resumes = list(ex.map(_safe_load, resume_paths))
+
+    # Embeddings: JD + uncached resumes in a single encode call. Unreadable files
+    # (__ERROR__ placeholders) are never embedded or cached; they score 0.
+    ok = [i for i, t in enumerate(resumes) if not t.startswith("__ERROR__")]
+    all_vecs = get_or_compute([resumes[i] for i in ok], embedder, uncached_prefix=[jd_text])
+    jd_vec, res_vecs = all_vecs[:1], all_vecs[1:]
+    sims = np.zeros(len(resumes), dtype=np.float32)
+    sims[ok] = _cosine_scores(jd_vec, res_vecs)
+
+    # optional NER, batched through nlp.pipe (error placeholders get an empty doc)
+    if use_spacy:
+        entities = extract_entities_spacy_many(
+            ["" if t.startswith("__ERROR__") else t for t in resumes]
+        )
+    else:
+        entities = [{} for _ in resumes]
+
+    # per-resume parsing/scoring is pure Python (regex-heavy), so spread it over
+    # processes once there are enough resumes to pay for the pool start-up
+    args = [
+        (path, text, float(score), ents, jd_kw_set, use_spacy)
+        for path, text, score, ents in zip(resume_paths, resumes, sims, entities)
+    ]
+    results = None
+    workers = os.cpu_count() or 1
+    if len(args) >= _PARALLEL_MIN_RESUMES and workers > 1:
         try:
-            txt = clean_text(load_file(p))
-        except Exception as e:
-            txt = f"__ERROR__ {e}"
-        resumes.append(txt)
-
-    # Embeddings
-    jd_vec = embedder.encode([jd_text])
-    res_vecs = embedder.encode(resumes)
-    sims = cosine_similarity(jd_vec, res_vecs).flatten()
-
-    rows = []
-    for path, text, score in zip(resume_paths, resumes, sims):
-        # Candidate name detection
-        candidate_name = extract_candidate_name(text, path)
-
-        item: Dict[str, Any] = {
-            "candidate_name": candidate_name,
-            "similarity": float(score),
-            "length_chars": len(text),
-            # show first 5 lines of resume text for debugging (optional)
-            "debug_preview": "\n".join(text.splitlines()[:5]) if not text.startswith("__ERROR__") else text,
-        }
-
-        if not text.startswith("__ERROR__"):
-            # call parser (may be custom)
-            try:
-                resume_info = parse_resume(text) or {}
-            except Exception:
-                resume_info = {}
-
-            # resume_info["skills"] expected to be a list
-            skills_list = resume_info.get("skills") if isinstance(resume_info.get("skills"), list) else []
-            matched_skills = sorted(set(skills_list).intersection(set(jd_keywords)))
-            skill_overlap = len(matched_skills) / max(1, len(jd_keywords))
-            final_score = 0.7 * score + 0.3 * skill_overlap
-
-            # education processing - defensive cleanup
-            raw_edu = resume_info.get("education") if isinstance(resume_info.get("education"), list) else []
-            cleaned_edu = _clean_education_list(raw_edu, candidate_name)
-
-            # fallback: try regex-based extraction if nothing valid
-            if not cleaned_edu:
-                cleaned_edu = _extract_education_block_via_regex(text)
-
-            # final join for dataframe cell
-            edu_cell = ", ".join(cleaned_edu) if cleaned_edu else ""
-
-            # experience processing (expect list)
-            exp_list = resume_info.get("experience") if isinstance(resume_info.get("experience"), list) else []
-            exp_cell = ", ".join(exp_list[:3]) if exp_list else ""
-
-            item.update({
-                "final_score": round(final_score, 3),
-                "skill_overlap": round(skill_overlap, 3),
-                "matched_skills": ", ".join(matched_skills),
-                "education": edu_cell,
-                "experience": exp_cell,
-            })
-
-            if use_spacy:
-                try:
-                    ents = extract_entities_spacy(text)
-                    item["ORGs"] = ", ".join(sorted(set(ents.get("ORG", [])[:5])))
-                    item["PERSONs"] = ", ".join(sorted(set(ents.get("PERSON", [])[:3])))
-                    item["DATEs"] = ", ".join(sorted(set(ents.get("DATE", [])[:3])))
-                except Exception:
-                    # if spacy entity extraction fails, skip it
-                    pass
-
-        rows.append(item)
+            # never fork: the caller may hold a loaded torch model, Streamlit server
+            # threads and the loader thread pool, and forking a multi-threaded
+            # process can deadlock the child
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context()) as ex:
+                chunksize = max(1, len(args) // (4 * workers))
+                results = list(ex.map(_rank_one, args, chunksize=chunksize))
+        except Exception:
+            # no usable process pool here (sandbox, frozen app, ...) -> run in-process
+            results = None
+    if results is None:
+        results = [_rank_one(a) for a in args]
+
+    rows = [item for item, _ in results]
+    details: Dict[str, Dict[str, Any]] = {
+        path: {"text": text, "parsed": info}
+        for (path, text, *_), (_, info) in zip(args, results)
+    }
 
     # Sort by final_score if available, else similarity
     if rows and "final_score" in rows[0]:
@@ -218,4 +311,6 @@ def rank_resumes_against_jd(
         sort_col = "similarity"
 
     df = pd.DataFrame(rows).sort_values(sort_col, ascending=False).reset_index(drop=True)
+    if return_details:
+        return df, details
     return df
@@ -3,34 +3,196 @@ NLP utilities: text cleaning, optional spaCy NER, and embedding model.
 """
 from __future__ import annotations
 from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
+import json
+import os
 import re
+import warnings
+
+import numpy as np
+
+_WS_RE = re.compile(r"\s+")
+_HSPACE_RE = re.compile(r"[^\S\n]+")  # any whitespace except newline
+_LINE_EDGE_RE = re.compile(r" ?\n ?")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
 
 def clean_text(text: str) -> str:
-    text = re.sub(r"\s+", " ", text).strip()
+    """Collapse all whitespace, newlines included, to single spaces."""
+    text = _WS_RE.sub(" ", text).strip()
     return text
 
+def clean_text_lines(text: str) -> str:
+    """
+    Like clean_text but keeps line structure: spaces/tabs collapse, lines are
+    stripped, and runs of blank lines shrink to one. Use this for resumes,
+    whose parsers rely on line breaks and blank-line section separators.
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = _HSPACE_RE.sub(" ", text)
+    text = _LINE_EDGE_RE.sub("\n", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text)
+    return text.strip()
+
+class NameCharTable(dict):
+    """
+    str.translate table for name cleanup: ASCII letters, whitespace and `extra`
+    are kept, every other character becomes a space. Each distinct character is
+    classified once, then translate() runs entirely in C.
+    """
+    def __init__(self, extra: str = ""):
+        super().__init__()
+        self.extra = extra
+
+    def __missing__(self, code: int):
+        ch = chr(code)
+        keep = ("a" <= ch <= "z") or ("A" <= ch <= "Z") or ch.isspace() or ch in self.extra
+        self[code] = code if keep else " "
+        return self[code]
+
+# NER only; everything else in en_core_web_sm is skipped
+_NER_DISABLE = ("tagger", "parser", "lemmatizer", "attribute_ruler")
+
+def _doc_entities(doc) -> Dict[str, List[str]]:
+    out = {}
+    for ent in doc.ents:
+        out.setdefault(ent.label_, []).append(ent.text)
+    return out
+
 def extract_entities_spacy(text: str) -> Dict[str, List[str]]:
     """
     Very light NER wrapper. Requires spaCy en_core_web_sm.
     Returns dict with keys: PERSON, ORG, GPE, DATE, etc.
     """
     try:
-        import spacy
-        nlp = spacy.load("en_core_web_sm")
-        doc = nlp(text)
-        out = {}
-        for ent in doc.ents:
-            out.setdefault(ent.label_, []).append(ent.text)
-        return out
+        from ._spacy import get_nlp
+        return _doc_entities(get_nlp(_NER_DISABLE)(text))
     except Exception:
         # If spaCy or model not installed, return empty.
         return {}
 
+def extract_entities_spacy_many(
+    texts: List[str], batch_size: int = 32
+) -> List[Dict[str, List[str]]]:
+    """
+    Batched extract_entities_spacy via nlp.pipe; one dict per input text.
+    """
+    try:
+        from ._spacy import get_nlp
+        nlp = get_nlp(_NER_DISABLE)
+        return [_doc_entities(doc) for doc in nlp.pipe(texts, batch_size=batch_size)]
+    except Exception:
+        # If spaCy or model not installed, return empty.
+        return [{} for _ in texts]
+
+def _pick_device() -> Optional[str]:
+    try:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except Exception:
+        # let sentence-transformers decide
+        return None
+
+ONNX_SUFFIX = "-onnx-int8"
+ONNX_ENV = "AI_RESUME_SCREENER_ONNX"
+
+def _wants_onnx(model_name: str) -> bool:
+    return model_name.endswith(ONNX_SUFFIX) or os.environ.get(ONNX_ENV, "") not in ("", "0")
+
+ST_DEFAULT_MAX_SEQ_LENGTH = 256  # all-MiniLM-L6-v2's sentence-transformers limit
+
+def _max_seq_length(model_dir: str) -> int:
+    """
+    Truncation length sentence-transformers uses for this model (its
+    sentence_bert_config.json), so both backends embed the same tokens.
+    The tokenizer's own model_max_length (512 for MiniLM) is longer.
+    """
+    try:
+        with open(os.path.join(model_dir, "sentence_bert_config.json"), encoding="utf-8") as f:
+            return int(json.load(f)["max_seq_length"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return ST_DEFAULT_MAX_SEQ_LENGTH
+
+class _OnnxEncoder:
+    """
+    int8-quantized ONNX export of a sentence-transformers model, run on CPU via
+    onnxruntime. Produce one with e.g.
+      optimum-cli export onnx -m sentence-transformers/all-MiniLM-L6-v2 minilm-onnx/
+      optimum-cli onnxruntime quantize --avx512_vnni --onnx_model minilm-onnx/ -o minilm-onnx-int8/
+    (copy the tokenizer files and sentence_bert_config.json into the output dir as well).
+    """
+    def __init__(self, model_name: str):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.max_seq_length = _max_seq_length(model_name)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            model_name, file_name="model_quantized.onnx", provider="CPUExecutionProvider"
+        )
+
+    def encode(self, texts: List[str], batch_size: int = 8) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.model.config.hidden_size), dtype=np.float32)
+        # length-sort so each batch pads to similar lengths, then restore order
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        out = np.empty((len(texts), self.model.config.hidden_size), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            idx = order[start:start + batch_size]
+            enc = self.tokenizer(
+                [texts[i] for i in idx],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            hidden = np.asarray(self.model(**enc).last_hidden_state, dtype=np.float32)
+            # mean pooling over real tokens, then L2-normalize (as sentence-transformers does)
+            mask = enc["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            out[idx] = pooled
+        return out
+
 class Embedder:
     def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+        self.model_name = model_name
+        self.onnx: Optional[_OnnxEncoder] = None
+        if _wants_onnx(model_name):
+            try:
+                self.onnx = _OnnxEncoder(model_name)
+                return
+            except Exception as e:
+                # an explicit *-onnx-int8 export can't be loaded by sentence-transformers
+                if model_name.endswith(ONNX_SUFFIX):
+                    raise RuntimeError(f"Failed to load ONNX model {model_name}: {e}")
+                # env var only: needs a local quantized export; otherwise use the regular model
+                warnings.warn(
+                    f"{ONNX_ENV} is set but {model_name} could not be loaded as an int8 ONNX "
+                    f"export ({e}); falling back to sentence-transformers."
+                )
         from sentence_transformers import SentenceTransformer
-        # sentence-transformers auto-downloads models on first run
-        self.model = SentenceTransformer(model_name)
+        # sentence-transformers auto-downloads models on first run;
+        # place the model on its device once, at load time
+        self.model = SentenceTransformer(model_name, device=_pick_device())
+
+    def encode(self, texts: List[str], batch_size: Optional[int] = None):
+        if self.onnx is not None:
+            return self.onnx.encode(texts, batch_size=batch_size or 8).astype(np.float16)
+        # small batches on CPU, large ones on GPU; sentence-transformers already
+        # length-sorts inputs inside encode(), so padding waste is minimal
+        if batch_size is None:
+            batch_size = 64 if str(self.model.device).startswith("cuda") else 8
+        # float16 halves the bytes moved through the cache and similarity step
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        ).astype(np.float16)
 
-    def encode(self, texts: List[str]):
-        return self.model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+@lru_cache(maxsize=4)
+def get_embedder(model_name: str = "sentence-transformers/all-MiniLM-L6-v2") -> Embedder:
+    """
+    Shared Embedder per model name, so repeat rankings skip the model load.
+    """
+    return Embedder(model_name=model_name)
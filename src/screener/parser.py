@@ -4,42 +4,66 @@ Supports .txt (always), and optionally .pdf/.docx if libraries are available.
 """
 from __future__ import annotations
 from typing import Optional
+import io
+import mmap
 import os
 
-def read_txt(path: str) -> str:
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        return f.read()
+def read_txt(path: str, max_chars: Optional[int] = None) -> str:
+    if max_chars is None:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return f.read()
+    # only touch the head of the file; utf-8 is at most 4 bytes per char
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = mm[: max_chars * 4].decode("utf-8", "ignore")
+    # match text-mode reads (universal newlines)
+    return text.replace("\r\n", "\n").replace("\r", "\n")[:max_chars]
 
-def read_pdf(path: str) -> str:
+def read_pdf(path: str, max_chars: Optional[int] = None) -> str:
     try:
         import fitz  # PyMuPDF
-        doc = fitz.open(path)
-        text = []
-        for page in doc:
-            text.append(page.get_text())
-        return "\n".join(text)
+        fitz.TOOLS.mupdf_display_errors(False)  # keep MuPDF warnings off stderr
+        # plain text only; never extract image blocks
+        flags = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_IMAGES
+        buf = io.StringIO()
+        with fitz.open(path) as doc:
+            for page in doc:
+                buf.write(page.get_text("text", flags=flags))
+                buf.write("\n")
+                if max_chars is not None and buf.tell() >= max_chars:
+                    break
+        text = buf.getvalue()
+        return text if max_chars is None else text[:max_chars]
     except Exception:
         # fallback: pdfminer
         try:
             from pdfminer.high_level import extract_text
-            return extract_text(path) or ""
+            text = extract_text(path) or ""
+            return text if max_chars is None else text[:max_chars]
         except Exception as e:
             raise RuntimeError(f"Failed to parse PDF {path}: {e}")
 
-def read_docx(path: str) -> str:
+def read_docx(path: str, max_chars: Optional[int] = None) -> str:
     try:
         import docx
         doc = docx.Document(path)
-        return "\n".join(p.text for p in doc.paragraphs)
+        text = "\n".join(p.text for p in doc.paragraphs)
+        return text if max_chars is None else text[:max_chars]
     except Exception as e:
         raise RuntimeError(f"Failed to parse DOCX {path}: {e}")
 
-def load_file(path: str) -> str:
+def load_file(path: str, max_chars: Optional[int] = None) -> str:
+    """
+    Load a resume/JD as text. With `max_chars`, stop early (e.g. for previews)
+    and return at most that many characters.
+    """
     ext = os.path.splitext(path)[1].lower()
     if ext == ".txt":
-        return read_txt(path)
+        return read_txt(path, max_chars)
     if ext == ".pdf":
-        return read_pdf(path)
+        return read_pdf(path, max_chars)
     if ext == ".docx":
-        return read_docx(path)
+        return read_docx(path, max_chars)
     raise ValueError(f"Unsupported file type: {ext}")
@@ -13,6 +13,12 @@ SKILLS = {
     "react", "javascript", "html", "css", "node", "java", "c++", "c#", "git",
     "nlp", "machine learning", "deep learning", "excel"
 }
+# common spellings / abbreviations -> canonical SKILLS entry
+SKILL_SYNONYMS = {
+    "ml": "machine learning", "dl": "deep learning", "k8s": "kubernetes",
+    "nodejs": "node", "reactjs": "react",
+}
+_SKILL_TERMS = {**{s: s for s in SKILLS}, **SKILL_SYNONYMS}
 
 SECTION_HEADERS_RE = re.compile(r"\b(skills|experience|education|projects|certifications|summary|objective|profile|contact)\b", re.I)
 YEARS_RE = re.compile(r"(\d{1,2})(?:\+)?\s*(?:years|yrs)\b", re.I)
@@ -22,6 +28,48 @@ DEGREE_PATTERNS = [
     r"\bmba\b", r"\bph\.?d\b", r"\bbsc\b", r"\bba\b"
 ]
 INSTITUTION_WORDS = [r"\buniversity\b", r"\bcollege\b", r"\binstitute\b", r"\bschool\b"]
+_DEG_INST_RE = re.compile("|".join(DEGREE_PATTERNS + INSTITUTION_WORDS))
+
+# skill lookup: one pass over the text instead of one regex per skill.
+# Uses a pyahocorasick automaton when installed, else one big alternation regex.
+try:
+    import ahocorasick
+
+    _SKILLS_AC = ahocorasick.Automaton()
+    for _term, _canon in _SKILL_TERMS.items():
+        _SKILLS_AC.add_word(_term, (len(_term), _canon))
+    _SKILLS_AC.make_automaton()
+except ImportError:
+    _SKILLS_AC = None
+
+_SKILLS_RE = re.compile(
+    r"(?<![a-z0-9])(?:"
+    + "|".join(re.escape(s) for s in sorted(_SKILL_TERMS, key=len, reverse=True))
+    + r")(?![a-z0-9])"
+)
+
+
+# boundary chars for the automaton path; must match _SKILLS_RE's [a-z0-9]
+_ASCII_WORD = frozenset("abcdefghijklmnopqrstuvwxyz0123456789")
+
+
+def find_skills(low: str) -> set:
+    """
+    Return SKILLS entries (synonyms resolved) in lowercased text, matched on
+    alphanumeric boundaries.
+    """
+    if _SKILLS_AC is None:
+        return {_SKILL_TERMS[t] for t in _SKILLS_RE.findall(low)}
+    found = set()
+    n = len(low)
+    for end, (length, skill) in _SKILLS_AC.iter(low):
+        start = end - length + 1
+        if start > 0 and low[start - 1] in _ASCII_WORD:
+            continue
+        if end + 1 < n and low[end + 1] in _ASCII_WORD:
+            continue
+        found.add(skill)
+    return found
 
 
 def _clean_snippet(s: str) -> str:
@@ -90,14 +138,7 @@ def parse_resume(text: str) -> Dict[str, List[str]]:
 
     # skills - heuristic token matching
     low = text.lower()
-    skills_found = set()
-    for skill in SKILLS:
-        if " " in skill:
-            if skill in low:
-                skills_found.add(skill)
-        else:
-            if re.search(rf"\b{re.escape(skill)}\b", low):
-                skills_found.add(skill)
+    skills_found = find_skills(low)
 
     # education extraction:
     edu_snips = []
@@ -131,8 +172,7 @@ def parse_resume(text: str) -> Dict[str, List[str]]:
             if not ln:
                 continue
             lowln = ln.lower()
-            found_degree_or_instit = any(re.search(pat, lowln) for pat in DEGREE_PATTERNS + INSTITUTION_WORDS)
-            if found_degree_or_instit:
+            if _DEG_INST_RE.search(lowln):
                 edu_snips.append(_clean_snippet(ln)[:160])
             if len(edu_snips) >= 3:
                 break
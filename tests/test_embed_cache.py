@@ -0,0 +1,46 @@
+import numpy as np
+
+from screener.embed_cache import get_or_compute
+
+
+class _CountingEncoder:
+    model_name = "dummy"
+
+    def __init__(self):
+        self.seen = []
+
+    def encode(self, texts):
+        self.seen.extend(texts)
+        return np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+
+
+def test_only_misses_are_encoded(tmp_path):
+    enc = _CountingEncoder()
+    first = get_or_compute(["alpha", "beta"], enc, cache_dir=str(tmp_path))
+    second = get_or_compute(["beta", "gamma  ", "alpha"], enc, cache_dir=str(tmp_path))
+    assert enc.seen == ["alpha", "beta", "gamma  "]
+    assert np.allclose(second[0], first[1])
+    assert np.allclose(second[2], first[0])
+
+
+def test_prefix_is_encoded_with_misses_but_not_cached(tmp_path):
+    enc = _CountingEncoder()
+    vecs = get_or_compute(["resume"], enc, cache_dir=str(tmp_path), uncached_prefix=["jd text"])
+    assert vecs.shape == (2, 2) and vecs[0][0] == len("jd text")
+    get_or_compute(["resume"], enc, cache_dir=str(tmp_path), uncached_prefix=["jd text"])
+    assert enc.seen == ["jd text", "resume", "jd text"]
+
+
+def test_duplicates_encoded_once(tmp_path):
+    enc = _CountingEncoder()
+    vecs = get_or_compute(["same", "other", "same "], enc, cache_dir=str(tmp_path))
+    assert enc.seen == ["same", "other"]
+    assert vecs.shape == (3, 2) and np.allclose(vecs[0], vecs[2])
+
+
+def test_onnx_backend_uses_separate_entries(tmp_path):
+    fp32, int8 = _CountingEncoder(), _CountingEncoder()
+    int8.onnx = object()
+    get_or_compute(["resume"], fp32, cache_dir=str(tmp_path))
+    get_or_compute(["resume"], int8, cache_dir=str(tmp_path))
+    assert int8.seen == ["resume"]
@@ -0,0 +1,6 @@
+from screener.jd_parser import extract_jd_skills
+
+
+def test_jd_skills_resolve_synonyms():
+    jd = "Hiring a Python dev with ML and k8s; SQL a plus."
+    assert extract_jd_skills(jd) == ["kubernetes", "machine learning", "python", "sql"]
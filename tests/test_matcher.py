@@ -1,6 +1,8 @@
 from screener.matcher import rank_resumes_against_jd
 
-def test_basic():
+def test_basic(monkeypatch, tmp_path):
+    import screener.embed_cache as embed_cache
+    monkeypatch.setattr(embed_cache, "CACHE_DIR", str(tmp_path))
     jd = "We are hiring a Python developer with experience in machine learning and SQL."
     resumes = [
         "Alice has 3 years of Python and ML experience. She knows TensorFlow and SQL.",
@@ -15,3 +17,85 @@ def test_basic():
         rpaths.append(p.name)
     df = rank_resumes_against_jd(jd, rpaths, use_spacy=False)
     assert df.iloc[0].similarity >= df.iloc[1].similarity
+
+class _StubEmbedder:
+    model_name = "stub"
+
+    def encode(self, texts, batch_size=None):
+        import numpy as np
+        v = np.array([[t.lower().count("python"), t.lower().count("sql"), 1.0] for t in texts])
+        return (v / np.linalg.norm(v, axis=1, keepdims=True)).astype(np.float16)
+
+def test_process_pool_matches_serial(monkeypatch, tmp_path):
+    import os
+    import pandas as pd
+    import screener.embed_cache as embed_cache
+    import screener.matcher as matcher
+
+    monkeypatch.setattr(embed_cache, "CACHE_DIR", str(tmp_path))
+    jd = "Python developer with SQL and machine learning."
+    texts = [
+        f"Candidate {i}\nEducation\nBSc Computer Science\n"
+        f"Skills: Python, SQL\n{i % 7} years experience"
+        if i % 2 else f"Person {i}\nGraphic designer, Adobe"
+        for i in range(12)
+    ]
+    paths = [f"r{i}.txt" for i in range(12)]
+    serial = rank_resumes_against_jd(jd, paths, embedder=_StubEmbedder(), resume_texts=texts)
+
+    # force the pool path and make sure it actually ran (no silent serial fallback)
+    used = []
+
+    class _SpyPool(matcher.ProcessPoolExecutor):
+        def map(self, *args, **kwargs):
+            out = list(super().map(*args, **kwargs))
+            used.append(len(out))
+            return iter(out)
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(matcher, "_PARALLEL_MIN_RESUMES", 2)
+    monkeypatch.setattr(matcher, "ProcessPoolExecutor", _SpyPool)
+    pooled = rank_resumes_against_jd(jd, paths, embedder=_StubEmbedder(), resume_texts=texts)
+
+    assert used == [12]
+    pd.testing.assert_frame_equal(serial, pooled)
+
+def test_unreadable_files_are_not_embedded(monkeypatch, tmp_path):
+    import screener.embed_cache as embed_cache
+    monkeypatch.setattr(embed_cache, "CACHE_DIR", str(tmp_path))
+    good = tmp_path / "good.txt"
+    good.write_text("Jane Doe\nSkills: Python, SQL")
+    seen = []
+
+    class _Spy(_StubEmbedder):
+        def encode(self, texts, batch_size=None):
+            seen.extend(texts)
+            return super().encode(texts, batch_size)
+
+    df = rank_resumes_against_jd(
+        "Python and SQL", [str(good), str(tmp_path / "missing.txt")], embedder=_Spy()
+    )
+    assert not any(t.startswith("__ERROR__") for t in seen)
+    assert sorted(df.similarity.tolist())[0] == 0.0
+    assert len(list(tmp_path.glob("*.npy"))) == 1
+
+def test_return_details_and_length_mismatch(monkeypatch, tmp_path):
+    import pytest
+    import screener.embed_cache as embed_cache
+    from screener.nlp import clean_text_lines
+    from screener.resume_parser import parse_resume
+    monkeypatch.setattr(embed_cache, "CACHE_DIR", str(tmp_path))
+
+    texts = ["Jane Doe\n\tSkills: Python,  SQL", "Bob Smith\nGraphic designer"]
+    paths = ["a.txt", "b.txt"]
+    df, details = rank_resumes_against_jd(
+        "Python and SQL", paths, embedder=_StubEmbedder(), resume_texts=texts, return_details=True
+    )
+    assert len(df) == 2 and set(details) == set(paths)
+    for path, raw in zip(paths, texts):
+        assert details[path]["text"] == clean_text_lines(raw)
+        assert details[path]["parsed"] == parse_resume(clean_text_lines(raw))
+    assert df.loc[df.candidate_name == "Jane Doe", "matched_skills"].item() == "python, sql"
+
+    with pytest.raises(ValueError):
+        rank_resumes_against_jd("jd", paths, embedder=_StubEmbedder(), resume_texts=texts[:1])
@@ -0,0 +1,46 @@
+import json
+
+import numpy as np
+
+from screener.nlp import (
+    ST_DEFAULT_MAX_SEQ_LENGTH,
+    _max_seq_length,
+    _OnnxEncoder,
+    clean_text,
+    clean_text_lines,
+)
+
+
+def test_clean_text_lines_keeps_line_structure():
+    raw = "Jane   Doe \r\n\tPython\tdev\n\n\n\nEducation:  \n B.Tech "
+    assert clean_text_lines(raw) == "Jane Doe\nPython dev\n\nEducation:\nB.Tech"
+    assert clean_text(raw) == "Jane Doe Python dev Education: B.Tech"
+
+
+def test_onnx_truncates_like_sentence_transformers(tmp_path):
+    assert _max_seq_length(str(tmp_path)) == ST_DEFAULT_MAX_SEQ_LENGTH == 256
+    (tmp_path / "sentence_bert_config.json").write_text(json.dumps({"max_seq_length": 128}))
+    assert _max_seq_length(str(tmp_path)) == 128
+
+    calls = []
+
+    class _Tok:
+        def __call__(self, texts, **kwargs):
+            calls.append(kwargs)
+            ones = np.ones((len(texts), 3))
+            return {"input_ids": ones, "attention_mask": ones}
+
+    class _Model:
+        class config:
+            hidden_size = 2
+
+        def __call__(self, **enc):
+            class _Out:
+                last_hidden_state = np.ones((len(enc["input_ids"]), 3, 2))
+            return _Out()
+
+    enc = object.__new__(_OnnxEncoder)
+    enc.tokenizer, enc.model, enc.max_seq_length = _Tok(), _Model(), 128
+    vecs = enc.encode(["a", "bb"])
+    assert vecs.shape == (2, 2)
+    assert calls and all(c["max_length"] == 128 and c["truncation"] for c in calls)
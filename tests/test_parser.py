@@ -0,0 +1,38 @@
+import pytest
+
+from screener.parser import read_pdf, read_txt
+
+
+@pytest.mark.parametrize(
+    "raw", [b"", b"Jane Doe\r\nPython\r\n\r\nSQL\rGit", "José\r\nété".encode()]
+)
+@pytest.mark.parametrize("n", [1, 5, 11, 1000])
+def test_read_txt_max_chars_matches_full_read(tmp_path, raw, n):
+    p = tmp_path / "r.txt"
+    p.write_bytes(raw)
+    full = read_txt(str(p))
+    assert "\r" not in read_txt(str(p), max_chars=n)
+    assert read_txt(str(p), max_chars=n) == full[:n]
+
+
+def test_read_pdf_stops_after_max_chars(tmp_path, monkeypatch):
+    fitz = pytest.importorskip("fitz")
+    path = tmp_path / "r.pdf"
+    doc = fitz.open()
+    for i in range(5):
+        doc.new_page().insert_text((72, 72), f"Page {i} " + "x" * 40)
+    doc.save(str(path))
+    doc.close()
+
+    pages_read = []
+    get_text = fitz.Page.get_text
+
+    def _spy(self, *args, **kwargs):
+        pages_read.append(self.number)
+        return get_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(fitz.Page, "get_text", _spy)
+    text = read_pdf(str(path), max_chars=60)
+    assert len(text) == 60 and text.startswith("Page 0")
+    assert pages_read == [0, 1]
+    assert "Page 4" in read_pdf(str(path))
@@ -0,0 +1,28 @@
+import pytest
+
+import screener.resume_parser as resume_parser
+from screener.resume_parser import find_skills, parse_resume
+
+
+@pytest.fixture(params=["ahocorasick", "regex"])
+def skill_backend(request, monkeypatch):
+    if request.param == "ahocorasick" and resume_parser._SKILLS_AC is None:
+        pytest.skip("pyahocorasick not installed")
+    if request.param == "regex":
+        monkeypatch.setattr(resume_parser, "_SKILLS_AC", None)
+    return request.param
+
+
+def test_skills_single_pass(skill_backend):
+    txt = "Jane Doe\nSkills: Python, C++, machine learning, nodejs, SQL."
+    skills = parse_resume(txt)["skills"]
+    assert skills == ["c++", "machine learning", "node", "python", "sql"]
+
+
+@pytest.mark.parametrize("low, expected", [
+    ("javaé and python²", {"java", "python"}),
+    ("éjava, c#é", {"java", "c#"}),
+    ("java8 pythonic sqlite", set()),
+])
+def test_find_skills_ascii_boundaries(skill_backend, low, expected):
+    assert find_skills(low) == expected